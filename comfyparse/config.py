@@ -30,16 +30,30 @@ class Namespace:
     :param kwargs: All keyword arguments are treated as entries in the
         internally-managed dictionary.
     """
+    __slots__ = ("_attrs", "_name", "_repr_name")
+
     def __init__(self, name: Optional[str] = None, **kwargs):
-        self._attrs = dict(kwargs)
-        self._name = name
-        self._repr_name = "Namespace" + (f"[{name}]" if name else "")
+        # Slots are set directly, as __setattr__ stores everything else as an entry.
+        setslot = object.__setattr__
+        setslot(self, "_attrs", dict(kwargs))
+        setslot(self, "_name", name)
+        setslot(self, "_repr_name", "Namespace" + (f"[{name}]" if name else ""))
 
     def __getattr__(self, name: str) -> Any:
-        if name.startswith("_") or name not in self._attrs:
+        if name.startswith("_"):
+            # Private names are only ever slots; don't touch them while they may be unset,
+            # such as when copy or pickle probe a not yet initialized instance.
+            raise AttributeError(name)
+        if name not in self._attrs:
             raise AttributeError(f"{self._repr_name} has no attribute '{name}'")
         return self._attrs[name]
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _NAMESPACE_SLOTS:
+            object.__setattr__(self, name, value)
+        else:
+            self._attrs[name] = value
+
     def __contains__(self, key: str) -> bool:
         return key in self._attrs
 
@@ -57,8 +71,13 @@ class Namespace:
         return f"{self._repr_name}{{" + ", ".join(contents) + "}"
 
     def copy(self) -> 'Namespace':
-        """Return a new Namespace which is a copy of this one."""
-        return Namespace(name=self._name, **self._attrs)
+        """Return a new Namespace which is a shallow copy of this one."""
+        new = object.__new__(Namespace)
+        setslot = object.__setattr__
+        setslot(new, "_attrs", self._attrs.copy())
+        setslot(new, "_name", self._name)
+        setslot(new, "_repr_name", self._repr_name)
+        return new
 
     def get(self, key: str, default: Optional[Any] = None) -> Any:
         """Return the given key if it exists within this Namespace, otherwise return the
@@ -66,6 +85,12 @@ class Namespace:
         """
         return self._attrs.get(key, default)
 
+    def setdefault(self, key: str, default: Optional[Any] = None) -> Any:
+        """Return the given key if it exists within this Namespace, otherwise set it to
+        ``default`` and return that.
+        """
+        return self._attrs.setdefault(key, default)
+
     def keys(self):
         """Return all keys within the Namespace."""
         return self._attrs.keys()
@@ -85,6 +110,16 @@ class Namespace:
                 self[key] = other[key]
 
 
+_NAMESPACE_SLOTS = frozenset(Namespace.__slots__)
+
+
+def _required_first(entries):
+    """Return the given settings or blocks as a tuple, with required entries first and
+    otherwise in their original order.
+    """
+    return tuple(sorted(entries, key=lambda x: not x.required))
+
+
 class ConfigSetting:
     """Defines the specification for a single configuration setting.
 
@@ -98,6 +133,10 @@ class ConfigSetting:
     :param validate: Optionally, a callable which accepts the (potentially converted)
         value and returns whether or not it is a valid value for the setting.
     """
+    __slots__ = (
+        "name", "desc", "required", "default", "choices", "convert", "validate",
+    )
+
     def __init__(
             self, name: str, desc: str = "", required: bool = False,
             default: Optional[Any] = None, choices: Optional[Sequence] = None,
@@ -129,18 +168,21 @@ class ConfigSetting:
 
     def validate_value(self, raw_value: Optional[str] = None) -> Any:
         """Returns a validated and optionally converted value from a raw value (or None)"""
-        if self.required and raw_value is None:
-            raise ValidationError(f"Missing required setting: {self.name}")
-
-        if raw_value is not None:
+        # The fields are read on every call, rather than summarized when the setting is
+        # created, as they are public and may be changed afterwards.
+        if raw_value is None:
+            if self.required:
+                raise ValidationError(f"Missing required setting: {self.name}")
+            value = self.default
+        elif not self.convert:
+            value = raw_value
+        else:
             try:
-                value = self.convert(raw_value) if self.convert else raw_value
+                value = self.convert(raw_value)
             except Exception as exc:
                 raise ValidationError(
                     f"Error on setting '{self.name}' with value '{raw_value}'"
                 ) from exc
-        else:
-            value = self.default
 
         if self.choices and value not in self.choices:
             raise ValidationError(
@@ -167,6 +209,10 @@ class ConfigBlock:
     :param validate: Optionally, a callable which accepts the block after each field has
         been validated and returns whether or not is is valid.
     """
+    __slots__ = (
+        "kind", "named", "desc", "required", "validate", "settings", "children",
+    )
+
     def __init__(
             self, kind: str, named: bool = False, desc: str = "", required: bool = False,
             validate: Optional[Callable[[Namespace], bool]] = None):
@@ -254,12 +300,12 @@ class ConfigBlock:
             rval += "Name".center(lname) + " " + "Required/".center(ldefault) + " Description\n"
             rval += (" " * lname) + " " + "Default".center(ldefault) + "\n"
             rval += ("=" * lname) + " " + ("=" * ldefault) + " ==========="
-            for setting in sorted(self.settings.values(), key=lambda x: not x.required):
+            for setting in _required_first(self.settings.values()):
                 rval += setting.render_as_table_row(lname, ldefault)
             rval += "\n" + ("=" * lname) + " " + ("=" * ldefault) + " ===========\n"
         if self.children:
             rval += "\nThe following subblocks are required/supported:"
-            for block in sorted(self.children.values(), key=lambda x: not x.required):
+            for block in _required_first(self.children.values()):
                 rval += "\n\n" + block.generate_docs(level+1)
         return rval
 
@@ -273,36 +319,56 @@ class ConfigBlock:
                 ldefault = lendef
         return lname, ldefault
 
-    def validate_block(self, block: Namespace) -> Namespace:
+    def validate_block(self, block: Union[Namespace, dict]) -> Namespace:
         """Returns a validated copy of the given block with all child blocks and settings
         validated. Settings values in the returned Namespace will also have been converted
-        if a ``convert`` callable was defined for them.
+        if a ``convert`` callable was defined for them. The given block is not modified.
+        Keys present in the given block keep their order, followed by any defaults.
         """
-        validated = block.copy()
-        for key in block:
-            if key not in self.settings and key not in self.children:
-                raise ValidationError(f"Unrecognized setting or block kind: {key}")
-            if key in self.settings and isinstance(block[key], Namespace):
-                raise ValidationError(f"Invalid block kind should be setting: {key}")
-            if key in self.children:
-                if not isinstance(block[key], (Namespace, dict)):
+        # Work on the underlying dicts directly, rather than through Namespace's
+        # methods, as this runs for every setting of every block. Hand-built
+        # configurations may also give block instances as plain mappings.
+        if isinstance(block, Namespace):
+            attrs, name = block._attrs, block._name
+        else:
+            attrs, name = block, None
+
+        validated = Namespace(name=name)
+        result = validated._attrs
+        settings, children = self.settings, self.children
+        for key, value in attrs.items():
+            if key in settings:
+                if isinstance(value, Namespace):
+                    raise ValidationError(f"Invalid block kind should be setting: {key}")
+            elif key in children:
+                if not isinstance(value, (Namespace, dict)):
                     raise ValidationError(f"Invalid setting should be a block: {key}")
-
-        for name, setting in self.settings.items():
-            validated[name] = setting.validate_value(block.get(name, None))
-
-        for kind, child in self.children.items():
-            if kind not in block:
-                if child.required:
-                    raise ValidationError(f"Missing required block: {kind}")
-                if child.named:
-                    continue
-                block[kind] = Namespace()
-            if isinstance(block[kind], dict):
-                for key in block[kind]:
-                    validated[kind][key] = child.validate_block(block[kind][key])
             else:
-                validated[kind] = child.validate_block(block[kind])
+                raise ValidationError(f"Unrecognized setting or block kind: {key}")
+            # Reserve the key's position, so the result keeps the input's order, followed
+            # by any settings and blocks which were filled in.
+            result[key] = None
+
+        for key, setting in settings.items():
+            result[key] = setting.validate_value(attrs.get(key))
+
+        # Child blocks are validated recursively. The recursion is only as deep as the
+        # schema's nesting, and profiling showed no cost in the calls themselves.
+        for kind, child in children.items():
+            if kind in attrs:
+                value = attrs[kind]
+            elif child.required:
+                raise ValidationError(f"Missing required block: {kind}")
+            elif child.named:
+                continue
+            else:
+                value = Namespace()
+            if isinstance(value, dict):
+                result[kind] = {
+                    key: child.validate_block(named) for key, named in value.items()
+                }
+            else:
+                result[kind] = child.validate_block(value)
 
         if self.validate is not None and not self.validate(validated):
             raise ValidationError(f"Validation check failed for block {self.kind}")
@@ -6,112 +6,99 @@
     translating raw input strings into a token stream for the parser.
 """
 import collections
-import enum
+import functools
 import logging
+import re
+import sys
+from collections.abc import Iterator
 
 
 logger = logging.getLogger("comfyparse")
 
 Token = collections.namedtuple('Token', 'value, kind')
 
-State = enum.Enum('State', ["READY", "VALUE", "STRING", "SYNTAX", "COMMENT"])
+# Token kinds. These are plain ints rather than enum members, as the parser compares
+# them for nearly every token.
+KIND_STRING, KIND_SYNTAX = range(2)
+KIND_NAMES = ("STRING", "SYNTAX")
+
+# Sources longer than this many characters are not kept in the token cache.
+CACHE_MAX_SOURCE = 64 * 1024
+
+# Matches one complete backslash escape sequence, as understood by "unicode_escape".
+_ESCAPE_RE = re.compile(r"""
+    \\(?:x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N\{[^}]*\}|[0-7]{1,3}|.)
+""", re.VERBOSE | re.DOTALL)
 
 
 class ComfyLexer:
     """Defines a ComfyLexer instance. Use ``peek()`` and ``consume()`` to access token
     objects. Delays tokenization until explicitly requested, or a method is used which
-    requires tokens to have been generated.
+    requires tokens to have been generated. Alternatively, ``tokens()`` streams the
+    tokens without storing them.
 
     :param source: The source string to render into tokens.
     """
-    WHITESPACE = "\t "
-    COMMENT = "%#"
-    SYNTAX = "{}[]=:,;\n"
-    STMTEND = ";\n"
-    ASSIGNMENT = "=:"
-    QUOTES = "\'\""
+    WHITESPACE = frozenset("\t ")
+    COMMENT = frozenset("%#")
+    SYNTAX = frozenset("{}[]=:,;\n")
+    STMTEND = frozenset(";\n")
+    ASSIGNMENT = frozenset("=:")
+    LISTSEP = frozenset(",]")
+    QUOTES = frozenset("\'\"")
 
     def __init__(self, source: str):
-        self.state: State = State.READY
         self._source: str = source
-        self._srcline: int = 0
-        self._srcchar: int = 0
 
         self._tokens: list[Token] = []
         self._tknidx: int = 0
 
-    def _peek_char(self, k: int=0) -> str:
-        return self._source[self._srcchar + k]
-
-    def _consume_char(self, k: int=1) -> str:
-        char = self._source[self._srcchar:self._srcchar+k]
-        self._srcchar += k
-        return char
-
-    def _tokenize(self) -> None:
-        try:
-            token = ""
-            while self._srcchar < len(self._source):
-                if self.state == State.READY:
-                    if self._peek_char() in self.WHITESPACE:
-                        self._consume_char()
-                    elif self._peek_char() in self.COMMENT:
-                        self.state = State.COMMENT
-                    elif self._peek_char() in self.SYNTAX:
-                        self.state = State.SYNTAX
-                    elif self._peek_char() in self.QUOTES:
-                        self.state = State.STRING
-                        token = self._consume_char()
-                    else:
-                        self.state = State.VALUE
-                        token = self._consume_char()
-
-                elif self.state == State.COMMENT:
-                    if self._peek_char() != "\n":
-                        self._consume_char()
-                    else:
-                        self._tokens.append(Token(self._consume_char(), State.SYNTAX))
-                        self.state = State.READY
-
-                elif self.state == State.SYNTAX:
-                    self._tokens.append(Token(self._consume_char(), self.state))
-                    self.state = State.READY
-
-                elif self.state == State.STRING:
-                    if self._peek_char() == "\\":
-                        token += bytes(self._consume_char(2), 'utf-8').decode("unicode_escape")
-                    elif self._peek_char() == token[0]:
-                        self._consume_char()
-                        self._tokens.append(Token(token[1:], self.state))
-                        self.state = State.READY
-                    else:
-                        token += self._consume_char()
-
-                elif self.state == State.VALUE:
-                    nchar = self._peek_char()
-                    if nchar in self.WHITESPACE or nchar in self.COMMENT or nchar in self.SYNTAX:
-                        self._tokens.append(Token(token, State.STRING))
-                        self.state = State.READY
-                    elif nchar in self.QUOTES:
-                        raise SyntaxError(
-                            f"Unexpected quote in unquoted string starting: {token}"
-                        )
-                    else:
-                        token += self._consume_char()
-
-            if self.state != State.READY:
-                if self.state == State.VALUE:
-                    self.state = State.STRING
-                self._tokens.append(Token(token, self.state))
-
-        except IndexError as exc:
-            raise SyntaxError("Unexpected EOF") from exc
+    def tokens(self) -> Iterator[Token]:
+        """Scan the input source, yielding each token as soon as it is recognized."""
+        source, length, quotes = self._source, len(self._source), self.QUOTES
+        syntax_tokens, intern = _SYNTAX_TOKENS, sys.intern
+        pos = 0
+        for match in _TOKEN_RE.finditer(source):
+            if match.start() != pos:
+                # Only an unclosed quote fails to match, leaving an empty match there
+                # and making the next one start further ahead.
+                break
+            kind = match.lastgroup
+            pos = match.end()
+            if kind == "SYNTAX":
+                yield syntax_tokens[match.group(kind)]
+            elif kind == "VALUE":
+                if pos < length and source[pos] in quotes:
+                    raise _syntax_error(
+                        f"Unexpected quote in unquoted string starting: {match.group(kind)}",
+                        source, pos,
+                    )
+                yield Token(intern(match.group(kind)), KIND_STRING)
+            elif kind == "STRING":
+                value = match.group(kind)[1:-1]
+                if "\\" in value:
+                    try:
+                        value = _ESCAPE_RE.sub(_unescape, value)
+                    except UnicodeDecodeError as exc:
+                        raise _syntax_error(
+                            f"Invalid escape sequence in string: {value}",
+                            source, match.start(kind),
+                        ) from exc
+                yield Token(value, KIND_STRING)
+
+        if pos != length:
+            raise _syntax_error("Unexpected EOF in quoted string", source, pos)
 
     def tokenize(self) -> None:
         """Explicitly invoke tokenization of the input source."""
         if not self._tokens:
-            self._tokenize()
-            logger.debug("Tokens: %s", [tk.value for tk in self._tokens])
+            # The cache holds ComfyLexer's own tokens, so subclasses always tokenize.
+            if type(self) is ComfyLexer and len(self._source) <= CACHE_MAX_SOURCE:
+                self._tokens = list(_cached_tokens(self._source))
+            else:
+                self._tokens = list(self.tokens())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tokens: %s", [tk.value for tk in self._tokens])
 
     def peek(self, offset: int=0) -> Token:
         """Return the token at the current position plus the optional offset. Does not
@@ -131,3 +118,57 @@ class ComfyLexer:
         """Return whether or not all tokens have been consumed."""
         self.tokenize()
         return self._tknidx >= len(self._tokens)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_tokens(source: str) -> tuple[Token, ...]:
+    """Return the tokens of the given source, reusing the result for sources which have
+    been tokenized recently, such as configuration files which are reloaded.
+    """
+    return tuple(ComfyLexer(source).tokens())
+
+
+def _syntax_error(message: str, source: str, pos: int) -> SyntaxError:
+    """Return a SyntaxError for the given position in the source, carrying its line number
+    and offset.
+    """
+    lineno = source.count("\n", 0, pos) + 1
+    offset = pos - source.rfind("\n", 0, pos)
+    return SyntaxError(message, (None, lineno, offset, None))
+
+
+def _unescape(match: re.Match) -> str:
+    """Decode a single backslash escape sequence matched within a quoted string."""
+    return bytes(match.group(), 'utf-8').decode("unicode_escape")
+
+
+def _charset(chars: frozenset) -> str:
+    """Return the given characters escaped for use within a regex character class."""
+    return "".join(re.escape(char) for char in sorted(chars))
+
+
+# Matches the next token after skipping any whitespace and comments. The token itself
+# is optional so that trailing whitespace and comments are consumed too. Quoted strings
+# may contain any character, including newlines, and backslash escapes.
+_TOKEN_RE = re.compile(r"""
+    (?:[{whitespace}]+|[{comment}][^\n]*)*
+    (?:
+          (?P<SYNTAX>[{syntax}])
+        | (?P<VALUE>[^{value_end}]+)
+        | (?P<STRING>{quoted})
+    )?
+""".format(
+    whitespace=_charset(ComfyLexer.WHITESPACE),
+    comment=_charset(ComfyLexer.COMMENT),
+    syntax=_charset(ComfyLexer.SYNTAX),
+    value_end=_charset(
+        ComfyLexer.WHITESPACE | ComfyLexer.COMMENT | ComfyLexer.SYNTAX | ComfyLexer.QUOTES
+    ),
+    quoted="|".join(
+        rf"{quote}[^{quote}\\]*(?:\\.[^{quote}\\]*)*{quote}"
+        for quote in map(re.escape, sorted(ComfyLexer.QUOTES))
+    ),
+), re.VERBOSE | re.DOTALL)
+
+# Syntax tokens are immutable and few in number, so a single instance of each is shared.
+_SYNTAX_TOKENS = {char: Token(char, KIND_SYNTAX) for char in ComfyLexer.SYNTAX}
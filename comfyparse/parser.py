@@ -14,7 +14,7 @@ from collections.abc import Callable, Sequence
 from typing import Any, Optional, Union
 
 from comfyparse.config import ConfigBlock, Namespace
-from comfyparse.lexer import ComfyLexer, State as LexerState
+from comfyparse.lexer import ComfyLexer, KIND_STRING
 
 
 logger = logging.getLogger("comfyparse")
@@ -93,10 +93,10 @@ class ComfyParser:
         return self.validate(result)
 
     def parse_config_file(self, path: str, validate: bool = True) -> Namespace:
-        """Open and parse the contents of the given file path, returning the resulting
-        configuration Namespace.
+        """Open and parse the contents of the given UTF-8 encoded file path, returning the
+        resulting configuration Namespace.
         """
-        with open(path, 'r') as fp:
+        with open(path, 'r', encoding='utf-8') as fp:
             return self.parse_config_string(fp.read(), validate=validate)
 
     def parse_config_string(self, data: str, validate: bool = True) -> Namespace:
@@ -120,119 +120,116 @@ class ComfyParser:
         try:
             lexer.tokenize()
         except SyntaxError as exc:
-            raise ParseError(f"Invalid input at line {self._lineno}") from exc
-
-        self._lineno = 1
+            raise ParseError(f"Invalid input at line {exc.lineno}") from exc
+
+        # The grammar is walked with a single loop over the token list, rather than with
+        # a function per rule, keeping open blocks and lists on explicit stacks:
+        #
+        #   expr  = [stmt/block]
+        #   block = string [string] '{' *expr '}'
+        #   stmt  = string ('=' / ':') value (';' / '\n')
+        #   value = list / string
+        #   list  = '[' value *(',' value) ']'
+        #
+        # The grammar is LL(1) and each token is read once, so nothing needs memoizing.
+        # Running past the end of the tokens raises IndexError, reported as an EOF.
+        tokens, num_tokens = lexer._tokens, len(lexer._tokens)
+        assignment, stmtend, listsep = lexer.ASSIGNMENT, lexer.STMTEND, lexer.LISTSEP
+        lineno, idx = 1, 0
+        debug = logger.isEnabledFor(logging.DEBUG)
         parsed = Namespace()
         block_stack = [parsed]
 
-        def parse_expr() -> None:
-            """Grammar: expr = [stmt/block]"""
-            logger.debug("Line %s: Enter expr", self._lineno)
-            parse_newline()
-            if lexer.is_exhausted():
-                return
-
-            if lexer.peek(1).value in lexer.ASSIGNMENT:
-                parse_stmt()
-            else:
-                parse_block()
-
-            parse_newline()
-            logger.debug("Line %s: Exit expr", self._lineno)
-
-        def parse_block() -> None:
-            """Grammar: block = string [string] '{' *expr '}'"""
-            logger.debug("Line %s: Enter block", self._lineno)
-            kind = lexer.consume()[0]
-            if lexer.peek().value == '{':
-                lexer.consume()
-                new_block = Namespace()
-                block_stack[-1][kind.value] = new_block
-                block_stack.append(new_block)
-            elif lexer.peek().kind == LexerState.STRING and lexer.peek(1).value == '{':
-                name = lexer.consume(2)[0]
-                new_block = Namespace(name=name.value)
-                try:
-                    block_stack[-1][kind.value][name.value] = new_block
-                except KeyError:
-                    block_stack[-1][kind.value] = {name.value: new_block}
-                block_stack.append(new_block)
-            else:
-                raise ParseError(f"Invalid block syntax at line {self._lineno}")
-
-            parse_newline()
-            while lexer.peek().value != '}':
-                parse_expr()
-            lexer.consume()
-            block_stack.pop()
-            logger.debug("Line %s: Exit block", self._lineno)
-
-        def parse_stmt() -> None:
-            """Grammar: stmt = string ('=' / ':') value (';' / '\n')"""
-            logger.debug("Line %s: Enter stmt", self._lineno)
-            key = lexer.consume(2)[0]
-            value = parse_value()
-            if lexer.peek().value not in lexer.STMTEND:
-                raise ParseError(f"Missing ';' or newline on line {self._lineno} after '{value}'")
-            if lexer.peek().value == ';':
-                lexer.consume()
-            parse_newline()
-            block_stack[-1][key.value] = value
-            logger.debug("Line %s: Exit stmt", self._lineno)
-
-        def parse_value() -> Union[str, list[str]]:
-            """Grammar: value = list / string"""
-            logger.debug("Line %s: Enter value", self._lineno)
-            rval = parse_list() if lexer.peek().value == '[' else parse_string()
-            logger.debug("Line %s: Exit value", self._lineno)
-            return rval
-
-        def parse_list() -> list:
-            """Grammar: list = '[' value *(',' value) ']'"""
-            logger.debug("Line %s: Enter list", self._lineno)
-            lexer.consume() # Pull off the starting '['
-            rval: list[Union[str, list]] = []
+        try:
             while True:
-                parse_newline() # Allow arbitrary newlines
-                if lexer.peek().value == '[':
-                    rval.append(parse_list()) # Support nested lists
-                elif lexer.peek().kind == LexerState.STRING:
-                    rval.append(parse_string())
-                else:
-                    raise ParseError(
-                        "Unexpected token '{lexer.peek().value}' in list on line {self._lineno}"
-                    )
-                parse_newline()
-                if lexer.peek().value not in ',]':
-                    raise ParseError(f"Missing ',' or ']' at line {self._lineno}")
-                token = lexer.consume()[0]
-                if token.value == "]":
+                while idx < num_tokens and tokens[idx].value == '\n':
+                    idx += 1
+                    lineno += 1
+                if idx == num_tokens:
+                    if len(block_stack) > 1:
+                        raise IndexError(idx)
                     break
-                parse_newline()
-
-            logger.debug("Line %s: Exit list", self._lineno)
-            return rval
-
-        def parse_string() -> str:
-            """A string is any set of characters. Follows shell parsing rules."""
-            logger.debug("Line %s: Enter string", self._lineno)
-            token = lexer.consume()[0]
-            if token.kind != LexerState.STRING:
-                raise ParseError(f"Expected string at line {self._lineno}, got {token.value}")
-            self._lineno += token.value.count("\n") # Account for newlines in strings
-            logger.debug("Line %s: Exit string", self._lineno)
-            return token.value
-
-        def parse_newline() -> None:
-            while not lexer.is_exhausted() and lexer.peek().value == '\n':
-                lexer.consume()
-                self._lineno += 1
 
-        try:
-            while not lexer.is_exhausted():
-                parse_expr()
+                token = tokens[idx]
+                if token.value == '}' and len(block_stack) > 1:
+                    idx += 1
+                    block_stack.pop()
+                    if debug:
+                        logger.debug("Line %s: Exit block", lineno)
+                    continue
+
+                if tokens[idx+1].value not in assignment:
+                    # block = string [string] '{' *expr '}'
+                    if debug:
+                        logger.debug("Line %s: Enter block %s", lineno, token.value)
+                    if tokens[idx+1].value == '{':
+                        idx += 2
+                        new_block = Namespace()
+                        block_stack[-1][token.value] = new_block
+                    elif tokens[idx+1].kind == KIND_STRING and tokens[idx+2].value == '{':
+                        name = tokens[idx+1].value
+                        idx += 3
+                        new_block = Namespace(name=name)
+                        block_stack[-1].setdefault(token.value, {})[name] = new_block
+                    else:
+                        raise ParseError(f"Invalid block syntax at line {lineno}")
+                    block_stack.append(new_block)
+                    continue
+
+                # stmt = string ('=' / ':') value (';' / '\n')
+                if debug:
+                    logger.debug("Line %s: Enter stmt %s", lineno, token.value)
+                idx += 2
+                value: Union[str, list]
+                if tokens[idx].value == '[':
+                    idx += 1
+                    value = []
+                    list_stack = [value]
+                    while list_stack:
+                        while tokens[idx].value == '\n':
+                            idx += 1
+                            lineno += 1
+                        item = tokens[idx]
+                        idx += 1
+                        if item.value == '[':
+                            nested: list = []
+                            list_stack[-1].append(nested) # Support nested lists
+                            list_stack.append(nested)
+                            continue
+                        if item.kind != KIND_STRING:
+                            raise ParseError(
+                                f"Unexpected token '{item.value}' in list on line {lineno}"
+                            )
+                        lineno += item.value.count("\n") # Account for newlines in strings
+                        list_stack[-1].append(item.value)
+
+                        # Close any lists ending after this value.
+                        while list_stack:
+                            while tokens[idx].value == '\n':
+                                idx += 1
+                                lineno += 1
+                            if tokens[idx].value not in listsep:
+                                raise ParseError(f"Missing ',' or ']' at line {lineno}")
+                            idx += 1
+                            if tokens[idx-1].value != "]":
+                                break
+                            list_stack.pop()
+                else:
+                    item = tokens[idx]
+                    idx += 1
+                    if item.kind != KIND_STRING:
+                        raise ParseError(f"Expected string at line {lineno}, got {item.value}")
+                    lineno += item.value.count("\n") # Account for newlines in strings
+                    value = item.value
+
+                if tokens[idx].value not in stmtend:
+                    raise ParseError(f"Missing ';' or newline on line {lineno} after '{value}'")
+                if tokens[idx].value == ';':
+                    idx += 1
+                block_stack[-1][token.value] = value
         except IndexError as exc:
             raise ParseError("Unexpected EOF") from exc
+        finally:
+            self._lineno = lineno
 
         return parsed
@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 
 from comfyparse.config import (
@@ -20,6 +22,32 @@ class TestNamespace(unittest.TestCase):
         with self.assertRaises(KeyError):
             value = Namespace()["test"]
 
+    def test_copy_and_pickle(self):
+        nsa = Namespace(name="test", val1="foo", val2=Namespace(a=[1, 2]))
+        for nsb in (copy.deepcopy(nsa), pickle.loads(pickle.dumps(nsa))):
+            self.assertEqual(str(nsb), str(nsa))
+            self.assertEqual(nsb.val2.a, [1, 2])
+
+    def test_copy(self):
+        nsa = Namespace(name="test", val1="foo")
+        nsa["name"] = "bar"
+        nsb = nsa.copy()
+        nsb["val1"] = "baz"
+        self.assertEqual(str(nsb), "Namespace[test]{val1: baz, name: bar}")
+        self.assertEqual(nsa.val1, "foo")
+
+    def test_attribute_assignment(self):
+        ns = Namespace(val1="foo")
+        ns.val2 = "bar"
+        self.assertEqual(ns["val2"], "bar")
+        self.assertEqual(list(ns.keys()), ["val1", "val2"])
+
+    def test_setdefault(self):
+        ns = Namespace(val1="foo")
+        self.assertEqual(ns.setdefault("val1", "bar"), "foo")
+        self.assertEqual(ns.setdefault("val2", "bar"), "bar")
+        self.assertEqual(ns.val2, "bar")
+
     def test_merge(self):
         nsa = Namespace(
             val1="foo", val2={"suba":Namespace(),"subb":Namespace(a=0)}, val3=Namespace(a="a",b=5)
@@ -42,6 +70,14 @@ class TestConfigSetting(unittest.TestCase):
         with self.assertRaises(ValidationError):
             ConfigSetting("test", choices=["a","b"]).validate_value("c")
 
+    def test_fields_changed_after_creation(self):
+        setting = ConfigSetting("test")
+        setting.convert = int
+        self.assertEqual(setting.validate_value("1"), 1)
+        setting.choices = [2]
+        with self.assertRaises(ValidationError):
+            setting.validate_value("1")
+
 
 class TestConfigBlock(unittest.TestCase):
     def setUp(self):
@@ -75,3 +111,27 @@ class TestConfigBlock(unittest.TestCase):
     def test_named_and_required_error(self):
         with self.assertRaises(ConfigSpecError):
             self.block.add_block("bad_block", named=True, required=True)
+
+    def test_input_not_modified(self):
+        self.block.add_block("named_block", named=True).add_setting("value", default="a")
+        block = Namespace(named_block={"foo": Namespace(name="foo")})
+        validated = self.block.validate_block(block)
+        self.assertEqual(validated.named_block["foo"].value, "a")
+        self.assertNotIn("value", block.named_block["foo"])
+        self.assertNotIn("test_block", block)
+
+    def test_mapping_instances(self):
+        self.block.add_block("named_block", named=True).add_setting("value", convert=int)
+        validated = self.block.validate_block(Namespace(named_block={"a": {"value": "1"}}))
+        self.assertIsInstance(validated.named_block["a"], Namespace)
+        self.assertEqual(validated.named_block["a"].value, 1)
+
+    def test_key_order(self):
+        self.block.add_setting("other_setting")
+        validated = self.block.validate_block(Namespace(other_setting="b", test_setting="a"))
+        self.assertEqual(list(validated.keys()), ["other_setting", "test_setting", "test_block"])
+
+    def test_settings_changed_directly(self):
+        self.block.settings["extra"] = ConfigSetting("extra", default="x")
+        self.assertEqual(self.block.validate_block(Namespace()).extra, "x")
+        self.assertEqual(self.block.validate_block(Namespace(extra="y")).extra, "y")
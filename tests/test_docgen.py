@@ -2,6 +2,7 @@ import datetime
 import unittest
 
 from comfyparse import ComfyParser
+from comfyparse.config import ConfigSetting
 
 
 GENERATED_DOCS = """MyProgram.conf
@@ -68,8 +69,27 @@ class TestDocGen(unittest.TestCase):
             convert=lambda x: datetime.timedelta(seconds=float(x)),
             validate=lambda x: abs(x) == x
         )
-        self.parser.add_block("debug", required=True, desc="Another block kind.")
+        self.debug = self.parser.add_block("debug", required=True, desc="Another block kind.")
 
     def test_documentation_generation(self):
         docs = self.parser.generate_docs()
         self.assertEqual(docs, GENERATED_DOCS)
+
+    def test_documentation_updated_after_change(self):
+        self.assertEqual(self.parser.generate_docs(), GENERATED_DOCS)
+        self.debug.add_setting("verbose", desc="Be loud.")
+        self.assertIn("verbose", self.parser.generate_docs())
+
+    def test_field_widths_of_settings_added_directly(self):
+        self.debug.settings["verbosity"] = ConfigSetting("verbosity", default="a" * 20)
+        self.assertEqual(self.debug._get_doc_field_widths(), (9, 20))
+
+    def test_documentation_updated_after_field_change(self):
+        self.assertEqual(self.parser.generate_docs(), GENERATED_DOCS)
+        self.debug.desc = "A changed description."
+        self.assertIn("A changed description.", self.parser.generate_docs())
+
+    def test_documentation_of_entries_added_directly(self):
+        self.debug.settings["verbosity"] = ConfigSetting("verbosity", desc="How loud to be.")
+        self.assertIn("verbosity None", self.parser.generate_docs())
+        self.assertIn("How loud to be.", self.parser.generate_docs())
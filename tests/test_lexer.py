@@ -1,6 +1,6 @@
 import unittest
 
-from comfyparse.lexer import ComfyLexer
+from comfyparse.lexer import ComfyLexer, CACHE_MAX_SOURCE, _cached_tokens
 
 simple_valid_text = """
 group servers {
@@ -26,10 +26,65 @@ class TestLexer(unittest.TestCase):
         lexer.tokenize()
         self.assertEqual([tk.value for tk in lexer._tokens], simple_valid_tokens)
 
+    def test_token_stream(self):
+        tokens = ComfyLexer(simple_valid_text).tokens()
+        self.assertEqual([tk.value for tk in tokens], simple_valid_tokens)
+
+    def test_consume(self):
+        lexer = ComfyLexer(simple_valid_text)
+        self.assertEqual([tk.value for tk in lexer.consume(3)], ['\n', 'group', 'servers'])
+        self.assertEqual([tk.value for tk in lexer.consume()], ['{'])
+        self.assertEqual(lexer.peek().value, '\n')
+
+    def test_cached_tokens(self):
+        source = simple_valid_text.replace("servers", "cached")
+        first, second = ComfyLexer(source), ComfyLexer(source)
+        first.tokenize()
+        hits = _cached_tokens.cache_info().hits
+        second.tokenize()
+        self.assertEqual(_cached_tokens.cache_info().hits, hits + 1)
+        self.assertEqual(first._tokens, second._tokens)
+
+    def test_subclass_not_cached(self):
+        class UpperLexer(ComfyLexer):
+            def tokens(self):
+                return (tk._replace(value=tk.value.upper()) for tk in super().tokens())
+
+        source = simple_valid_text.replace("servers", "subclass")
+        ComfyLexer(source).tokenize()
+        lexer = UpperLexer(source)
+        lexer.tokenize()
+        self.assertEqual(lexer.peek(1).value, "GROUP")
+
+    def test_large_source_not_cached(self):
+        source = "key = value\n" * (CACHE_MAX_SOURCE // 12 + 1)
+        misses = _cached_tokens.cache_info().misses
+        ComfyLexer(source).tokenize()
+        self.assertEqual(_cached_tokens.cache_info().misses, misses)
+
     def test_backslash_escapes(self):
         self.assertEqual(ComfyLexer("'\\\\'").peek().value, "\\")
         self.assertEqual(ComfyLexer("'\\n'").peek().value, "\n")
+        self.assertEqual(ComfyLexer("'\\x41\\u00e9'").peek().value, "A\u00e9")
+        self.assertEqual(ComfyLexer("'caf\u00e9\\t'").peek().value, "caf\u00e9\t")
+
+    def test_invalid_escape(self):
+        with self.assertRaises(SyntaxError):
+            ComfyLexer("'\\x4'").peek()
 
     def test_quote_in_value(self):
         with self.assertRaises(SyntaxError):
             ComfyLexer("val'ue").peek()
+
+    def test_unterminated_string(self):
+        with self.assertRaises(SyntaxError):
+            ComfyLexer("'value").peek()
+
+        with self.assertRaises(SyntaxError) as ctx:
+            ComfyLexer("key=value\n# comment\nkey = 'value").peek()
+        self.assertEqual((ctx.exception.lineno, ctx.exception.offset), (3, 7))
+
+    def test_comment_at_eof(self):
+        lexer = ComfyLexer("key=value # no trailing newline")
+        lexer.tokenize()
+        self.assertEqual([tk.value for tk in lexer._tokens], ["key", "=", "value"])
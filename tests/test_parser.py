@@ -98,21 +98,39 @@ class TestBlocks(unittest.TestCase):
         self.assertTrue(isinstance(config.hostgroup['web'], Namespace))
         self.assertTrue(config.hostgroup['web'].hosts == ['node01','node02'])
 
+    def test_empty_block_name(self):
+        config = self.parser.parse_config_string("hostgroup '' {hosts=node01;}")
+        self.assertEqual(config.hostgroup[''].hosts, 'node01')
+
     def test_invalid_block(self):
         with self.assertRaises(ParseError):
             config = self.parser.parse_config_string("hostgroup 'web' foo {")
 
     def test_invalid_list(self):
-        with self.assertRaises(ParseError):
-            config = self.parser.parse_config_string("hostgroup 'foo' { hosts=[:")
+        with self.assertRaisesRegex(ParseError, "Unexpected token ':' in list on line 2$"):
+            config = self.parser.parse_config_string("hostgroup 'foo' {\n hosts=[:")
 
         with self.assertRaises(ParseError):
             config = self.parser.parse_config_string("hostgroup 'foo' {hosts=[ a b")
 
+        with self.assertRaises(ParseError):
+            config = self.parser.parse_config_string("hostgroup 'foo' {hosts=[ a '' b ];}")
+
+    def test_debug_logging(self):
+        with self.assertLogs("comfyparse", level=logging.DEBUG) as logs:
+            self.parser.parse_config_string("hostgroup 'web' {\nhosts=node01;\n}")
+        self.assertIn("DEBUG:comfyparse:Line 2: Enter stmt hosts", logs.output)
+        self.assertIn("DEBUG:comfyparse:Line 3: Exit block", logs.output)
+
     def test_lexer_syntax_error(self):
         with self.assertRaises(ParseError):
             config = self.parser.parse_config_string("val'ue")
 
+    def test_lexer_error_line(self):
+        self.parser.parse_config_string("log_path=a\n\nlog_path=b\n")
+        with self.assertRaisesRegex(ParseError, "line 3$"):
+            self.parser.parse_config_string("hostgroup 'web' {\nhosts=node01;\ntimeout='5\n}")
+
 
 class TestNesting(unittest.TestCase):
     def setUp(self):